@@ -1,32 +1,81 @@
+import asyncio
+import logging
 from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
 from taxipred.backend.schemas import PredictionInput
 from taxipred.backend.responses import df_to_json_response
-from taxipred.backend.services import apply_dataset_defaults, predict_with_model
+from taxipred.backend.services import apply_dataset_defaults, predict_with_surface
 from taxipred.backend.dependencies import (
     load_model,
+    load_price_surface,
     load_training_data,
     compute_dataset_defaults,
 )
+from taxipred.backend.startup import HEAVY_MODULES, warmup_model
 from taxipred.common.explore import DataExplorer
+from taxipred.common.profiling import StartupReport
+
+logger = logging.getLogger(__name__)
+
+WARMUP_SHUTDOWN_TIMEOUT_S = 10.0
+
+
+def _warmup(
+    app: FastAPI, model, defaults: dict, surface, report: StartupReport
+) -> None:
+    try:
+        with report.phase("warmup"):
+            warmup_model(model, defaults, surface)
+    except Exception as e:
+        logger.exception("Warmup failed; /ready will keep returning 503")
+        report.fail(e)
+        report.log()
+        return
+    report.finish()
+    app.state.ready = True
+    report.log()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    model = load_model()
-    df = load_training_data()
-    defaults = compute_dataset_defaults(df)
+    report = StartupReport()
+    report.profile_imports(HEAVY_MODULES)
+
+    with report.phase("load_model"):
+        model = load_model()
+    with report.phase("load_training_data"):
+        df = load_training_data()
+    with report.phase("compute_defaults"):
+        defaults = compute_dataset_defaults(df)
+    with report.phase("load_price_surface"):
+        surface = load_price_surface(model, defaults)
 
     app.state.model = model
     app.state.df = df
     app.state.defaults = defaults
+    app.state.surface = surface
+    app.state.startup_report = report
+    app.state.ready = False
+
+    # Warm up off the event loop so /health answers while /ready stays false.
+    warmup_task = asyncio.create_task(
+        asyncio.to_thread(_warmup, app, model, defaults, surface, report)
+    )
 
     yield
 
+    # Cancelling would not stop the worker thread, so let it finish first.
+    _, pending = await asyncio.wait({warmup_task}, timeout=WARMUP_SHUTDOWN_TIMEOUT_S)
+    if pending:
+        logger.warning("Warmup still running at shutdown")
     del app.state.model
     del app.state.df
     del app.state.defaults
+    del app.state.surface
+    del app.state.startup_report
+    del app.state.ready
 
 
 app = FastAPI(lifespan=lifespan)
@@ -42,6 +91,15 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+async def ready():
+    report = app.state.startup_report.as_dict()
+    if not app.state.ready:
+        status = "warmup_failed" if report["error"] else "warming_up"
+        return JSONResponse(status_code=503, content={"status": status, "startup": report})
+    return {"status": "ready", "startup": report}
+
+
 @app.get("/stats")
 async def stats():
     explorer = DataExplorer(app.state.df)
@@ -58,7 +116,7 @@ async def sample(sample_size: int = Query(10, ge=1, le=100)):
 async def predict(payload: PredictionInput):
     input_data = payload.model_dump()
     input_data = apply_dataset_defaults(input_data, app.state.defaults)
-    prediction = predict_with_model(app.state.model, input_data)
+    prediction = predict_with_surface(app.state.surface, app.state.model, input_data)
     return {
         "prediction": prediction,
         "inputs_used": input_data,
@@ -1,18 +1,32 @@
 from __future__ import annotations
 
-import joblib
-import pandas as pd
+import logging
+import os
+from typing import TYPE_CHECKING
 
-from taxipred.common.constants import MODEL, TAXI_CSV_CLEANED
+from taxipred.common.constants import MODEL, PRICE_SURFACE, TAXI_CSV_CLEANED
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from taxipred.backend.surface import PriceSurface
+
+logger = logging.getLogger(__name__)
+
+SURFACE_MAX_ERROR = float(os.getenv("TAXIPRED_SURFACE_MAX_ERROR", "2.0"))
 
 
 def load_model():
     """Load the trained model artifact from disk."""
+    import joblib
+
     return joblib.load(MODEL)
 
 
 def load_training_data() -> pd.DataFrame:
     """Load the cleaned training dataset used for computing defaults and stats endpoints."""
+    import pandas as pd
+
     return pd.read_csv(TAXI_CSV_CLEANED)
 
 
@@ -25,3 +39,58 @@ def compute_dataset_defaults(df: pd.DataFrame) -> dict:
         "weather": df["weather"].mode().iloc[0],
         "traffic_conditions": df["traffic_conditions"].mode().iloc[0],
     }
+
+
+def load_price_surface(
+    model, defaults: dict, max_error: float = SURFACE_MAX_ERROR
+) -> PriceSurface | None:
+    """
+    Load the precomputed price surface if it exists and matches the live model and data.
+
+    Only cells whose stored interpolation error is within max_error are served
+    from the surface. Returns None (forest-only serving) when the file is
+    missing, was built from a different model, uses pricing fields that differ
+    from the current dataset defaults, has no cell within tolerance, or fails
+    a spot check against the model.
+    """
+    from taxipred.backend.surface import PriceSurface, model_fingerprint
+
+    if not PRICE_SURFACE.exists():
+        return None
+
+    surface = PriceSurface.load(PRICE_SURFACE, max_error)
+    if surface.fingerprint != model_fingerprint(model):
+        logger.warning(
+            "Price surface disabled: built from a different model; "
+            "rebuild it with `python -m taxipred.backend.surface`"
+        )
+        return None
+
+    current = {field: float(defaults[field]) for field in surface.pricing}
+    if surface.pricing != current:
+        logger.warning(
+            "Price surface disabled: built with pricing %s, dataset defaults are %s",
+            surface.pricing,
+            current,
+        )
+        return None
+    if surface.coverage == 0:
+        logger.warning(
+            "Price surface disabled: no cell within max error %.3f", max_error
+        )
+        return None
+
+    error = surface.spot_check(model)
+    if error > max_error:
+        logger.warning(
+            "Price surface disabled: spot check error %.3f exceeds %.3f", error, max_error
+        )
+        return None
+
+    logger.info(
+        "Price surface loaded: %.1f%% of cells within max error %.3f (worst %.3f)",
+        surface.coverage * 100,
+        max_error,
+        surface.max_error,
+    )
+    return surface
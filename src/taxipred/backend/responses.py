@@ -1,7 +1,13 @@
+from __future__ import annotations
+
 import json
-import pandas as pd
+from typing import TYPE_CHECKING
+
 from fastapi.responses import JSONResponse
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def df_to_json_response(df: pd.DataFrame) -> JSONResponse:
     """Serialize a DataFrame to a JSON array response (records orientation)."""
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import pandas as pd
-
 
 def apply_dataset_defaults(input_data: dict, defaults: dict) -> dict:
     """Fill missing optional fields in input_data using dataset-derived defaults."""
@@ -13,5 +11,14 @@ def apply_dataset_defaults(input_data: dict, defaults: dict) -> dict:
 
 def predict_with_model(model, input_data: dict) -> float:
     """Run model inference for a single request payload and return a scalar prediction."""
+    import pandas as pd
+
     input_df = pd.DataFrame([input_data])
     return float(model.predict(input_df)[0])
+
+
+def predict_with_surface(surface, model, input_data: dict) -> float:
+    """Answer from the precomputed price surface when it covers input_data, else the model."""
+    if surface is not None and surface.covers(input_data):
+        return surface.predict(input_data)
+    return predict_with_model(model, input_data)
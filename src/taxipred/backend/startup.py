@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from itertools import product
+
+from taxipred.backend.schemas import PredictionInput
+from taxipred.backend.services import (
+    apply_dataset_defaults,
+    predict_with_model,
+    predict_with_surface,
+)
+
+HEAVY_MODULES = ("numpy", "pandas", "joblib", "sklearn.ensemble", "sklearn.pipeline")
+
+WARMUP_DISTANCES_KM = (2.0, 10.0, 35.0)
+WARMUP_TIMES_OF_DAY = ("Morning", "Afternoon", "Evening", "Night")
+WARMUP_DAYS_OF_WEEK = ("Weekday", "Weekend")
+
+
+def build_warmup_inputs() -> list[dict]:
+    """Build representative request payloads spanning distances and categorical slots."""
+    return [
+        PredictionInput(
+            trip_distance_km=distance,
+            time_of_day=time_of_day,
+            day_of_week=day_of_week,
+        ).model_dump()
+        for distance, time_of_day, day_of_week in product(
+            WARMUP_DISTANCES_KM, WARMUP_TIMES_OF_DAY, WARMUP_DAYS_OF_WEEK
+        )
+    ]
+
+
+def warmup_model(model, defaults: dict, surface=None) -> int:
+    """
+    Run representative single-row predictions through the serving path.
+
+    Each input goes through `predict_with_surface`, as in `/predict`, and
+    also directly through the model. Inputs the surface covers would otherwise
+    leave the forest fallback cold. This pays one-off costs (lazy imports
+    inside sklearn, pandas dtype caches, pydantic validators) before real
+    traffic arrives.
+
+    Returns:
+        Number of warmup inputs executed.
+    """
+    inputs = build_warmup_inputs()
+    for input_data in inputs:
+        input_data = apply_dataset_defaults(input_data, defaults)
+        predict_with_surface(surface, model, input_data)
+        predict_with_model(model, input_data)
+    return len(inputs)
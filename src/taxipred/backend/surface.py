@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+from bisect import bisect_right
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from taxipred.common.constants import PRICE_SURFACE
+
+CATEGORIES = {
+    "time_of_day": ("Morning", "Afternoon", "Evening", "Night"),
+    "day_of_week": ("Weekday", "Weekend"),
+    "traffic_conditions": ("Low", "Medium", "High"),
+    "weather": ("Clear", "Rain", "Snow"),
+}
+PRICING_FIELDS = ("base_fare", "per_km_rate", "per_minute_rate")
+
+DEFAULT_DISTANCES_KM = np.linspace(0.5, 50.0, 100)
+DEFAULT_DURATIONS_MIN = np.linspace(0.0, 120.0, 121)
+
+
+class PriceSurface:
+    """
+    Model predictions precomputed over distance x duration x categorical slots.
+
+    Quotes that use the dataset's median pricing fields are answered by
+    bilinear interpolation over (distance, duration) within the matching
+    categorical slice, without running the forest. Each grid cell carries an
+    upper bound on the interpolation error anywhere inside it; cells whose
+    bound exceeds `max_error` are left to the forest.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        cell_errors: np.ndarray,
+        distances: np.ndarray,
+        durations: np.ndarray,
+        pricing: dict,
+        max_error: float = np.inf,
+        fingerprint: str | None = None,
+    ):
+        """
+        Args:
+            values: Prices with shape (*category sizes, n_distances, n_durations).
+            cell_errors: Upper bound on the absolute interpolation error per cell, with shape
+                (*category sizes, n_distances - 1, n_durations - 1).
+            distances: Strictly increasing distance axis (km).
+            durations: Strictly increasing duration axis (minutes).
+            pricing: Pricing field values the surface was evaluated with.
+            max_error: Cells with a larger error are not served from the surface.
+            fingerprint: `model_fingerprint` of the model the surface was built from.
+        """
+        self._values = values
+        self._cell_errors = cell_errors
+        self._within_tolerance = cell_errors <= max_error
+        self._distances = distances.tolist()
+        self._durations = durations.tolist()
+        self._index = {
+            field: {name: i for i, name in enumerate(names)}
+            for field, names in CATEGORIES.items()
+        }
+        self.pricing = pricing
+        self.fingerprint = fingerprint
+
+    @property
+    def max_error(self) -> float:
+        """Largest per-cell interpolation error bound."""
+        return float(self._cell_errors.max())
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of cells served from the surface."""
+        return float(self._within_tolerance.mean())
+
+    @classmethod
+    def build(
+        cls,
+        model,
+        defaults: dict,
+        distances: np.ndarray = DEFAULT_DISTANCES_KM,
+        durations: np.ndarray = DEFAULT_DURATIONS_MIN,
+    ) -> "PriceSurface":
+        """
+        Evaluate the fitted model over the full grid using default pricing fields.
+
+        Per-cell error bounds come from the forest's trees: the range of leaf
+        values reachable inside each cell bounds the model there, and bilinear
+        interpolation stays within the range of the cell's corner values.
+        """
+        pricing = {field: float(defaults[field]) for field in PRICING_FIELDS}
+        values = _evaluate(model, pricing, distances, durations)
+
+        model_min, model_max = _forest_cell_ranges(model, pricing, distances, durations)
+        corners = np.stack(
+            [
+                values[..., :-1, :-1],
+                values[..., 1:, :-1],
+                values[..., :-1, 1:],
+                values[..., 1:, 1:],
+            ]
+        )
+        cell_errors = np.maximum(
+            model_max - corners.min(axis=0), corners.max(axis=0) - model_min
+        ).astype(np.float32)
+
+        return cls(
+            values,
+            cell_errors,
+            np.asarray(distances),
+            np.asarray(durations),
+            pricing,
+            fingerprint=model_fingerprint(model),
+        )
+
+    @classmethod
+    def load(cls, path: Path = PRICE_SURFACE, max_error: float = np.inf) -> "PriceSurface":
+        """Load a surface saved with `save`, serving only cells within max_error."""
+        with np.load(path) as data:
+            pricing = dict(zip(PRICING_FIELDS, data["pricing"].tolist()))
+            fingerprint = str(data["fingerprint"]) if "fingerprint" in data.files else None
+            return cls(
+                data["values"],
+                data["cell_errors"],
+                data["distances"],
+                data["durations"],
+                pricing,
+                max_error,
+                fingerprint,
+            )
+
+    def save(self, path: Path = PRICE_SURFACE) -> None:
+        """Save the surface as a compressed .npz array file."""
+        np.savez_compressed(
+            path,
+            values=self._values,
+            cell_errors=self._cell_errors,
+            distances=np.asarray(self._distances),
+            durations=np.asarray(self._durations),
+            pricing=np.array([self.pricing[field] for field in PRICING_FIELDS]),
+            fingerprint=np.array(self.fingerprint or ""),
+        )
+
+    def covers(self, input_data: dict) -> bool:
+        """
+        Return True if input_data lies on the grid, uses the surface's pricing
+        and falls in a cell within tolerance.
+        """
+        distance = input_data["trip_distance_km"]
+        duration = input_data["trip_duration_minutes"]
+        if not self._distances[0] <= distance <= self._distances[-1]:
+            return False
+        if not self._durations[0] <= duration <= self._durations[-1]:
+            return False
+        if any(input_data[field] not in self._index[field] for field in CATEGORIES):
+            return False
+        if any(input_data[field] != value for field, value in self.pricing.items()):
+            return False
+
+        slot = tuple(self._index[field][input_data[field]] for field in CATEGORIES)
+        i, _ = _locate(self._distances, distance)
+        j, _ = _locate(self._durations, duration)
+        return bool(self._within_tolerance[slot][i, j])
+
+    def predict(self, input_data: dict) -> float:
+        """Interpolate the price for an input that `covers` accepts."""
+        slot = tuple(self._index[field][input_data[field]] for field in CATEGORIES)
+        i, fx = _locate(self._distances, input_data["trip_distance_km"])
+        j, fy = _locate(self._durations, input_data["trip_duration_minutes"])
+
+        v = self._values[slot]
+        return float(
+            v[i, j] * (1 - fx) * (1 - fy)
+            + v[i + 1, j] * fx * (1 - fy)
+            + v[i, j + 1] * (1 - fx) * fy
+            + v[i + 1, j + 1] * fx * fy
+        )
+
+    def spot_check(self, model, n_samples: int = 200, seed: int = 42) -> float:
+        """Return the largest difference to the model over random covered inputs."""
+        rng = np.random.default_rng(seed)
+        rows = [
+            {
+                "trip_distance_km": rng.uniform(self._distances[0], self._distances[-1]),
+                "trip_duration_minutes": rng.uniform(
+                    self._durations[0], self._durations[-1]
+                ),
+                **{field: str(rng.choice(names)) for field, names in CATEGORIES.items()},
+                **self.pricing,
+            }
+            for _ in range(n_samples)
+        ]
+        rows = [row for row in rows if self.covers(row)]
+        if not rows:
+            return 0.0
+        expected = model.predict(pd.DataFrame(rows))
+        actual = np.array([self.predict(row) for row in rows])
+        return float(np.abs(expected - actual).max())
+
+
+def model_fingerprint(model) -> str:
+    """Digest of a fitted pipeline's features and forest (tree splits and leaf values)."""
+    digest = hashlib.sha256()
+    names = model.named_steps["preprocess"].get_feature_names_out()
+    digest.update("\n".join(names).encode())
+    for tree in (estimator.tree_ for estimator in model.named_steps["model"].estimators_):
+        for array in (tree.feature, tree.threshold, tree.value):
+            digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def _evaluate(
+    model, pricing: dict, distances: np.ndarray, durations: np.ndarray
+) -> np.ndarray:
+    """Predict over every categorical slot x distance x duration combination."""
+    rows = [
+        dict(zip(CATEGORIES, slot), **pricing) for slot in product(*CATEGORIES.values())
+    ]
+
+    grid = pd.DataFrame(rows).loc[
+        np.repeat(np.arange(len(rows)), len(distances) * len(durations))
+    ].reset_index(drop=True)
+    dist, dur = np.meshgrid(distances, durations, indexing="ij")
+    grid["trip_distance_km"] = np.tile(dist.ravel(), len(rows))
+    grid["trip_duration_minutes"] = np.tile(dur.ravel(), len(rows))
+
+    shape = tuple(len(names) for names in CATEGORIES.values())
+    values = model.predict(grid).astype(np.float32)
+    return values.reshape(*shape, len(distances), len(durations))
+
+
+def _forest_cell_ranges(
+    model, pricing: dict, distances: np.ndarray, durations: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bound the pipeline's forest prediction from below and above within every cell.
+
+    Each tree is walked with the categorical and pricing inputs fixed per slot,
+    following both branches of distance/duration splits. The leaves reached
+    give each tree's min and max over a cell, and the forest mean is bounded
+    by the mean of those per-tree extremes.
+    """
+    preprocess = model.named_steps["preprocess"]
+    forest = model.named_steps["model"]
+    names = list(preprocess.get_feature_names_out())
+    dist_feature = names.index("num__trip_distance_km")
+    dur_feature = names.index("num__trip_duration_minutes")
+
+    rows = [
+        dict(
+            zip(CATEGORIES, slot),
+            **pricing,
+            trip_distance_km=distances[0],
+            trip_duration_minutes=durations[0],
+        )
+        for slot in product(*CATEGORIES.values())
+    ]
+    points = preprocess.transform(pd.DataFrame(rows))
+    points = points.toarray() if hasattr(points, "toarray") else np.asarray(points)
+
+    n_cells = (len(distances) - 1, len(durations) - 1)
+    lower = np.zeros((len(rows), *n_cells))
+    upper = np.zeros((len(rows), *n_cells))
+
+    for tree in (estimator.tree_ for estimator in forest.estimators_):
+        for k, point in enumerate(points):
+            tree_min = np.full(n_cells, np.inf)
+            tree_max = np.full(n_cells, -np.inf)
+            stack = [(0, -np.inf, np.inf, -np.inf, np.inf)]
+            while stack:
+                node, d_lo, d_hi, t_lo, t_hi = stack.pop()
+                feature = tree.feature[node]
+                if feature < 0:
+                    # Leaf covering distance (d_lo, d_hi] x duration (t_lo, t_hi].
+                    i0 = np.searchsorted(distances[1:], d_lo, side="right")
+                    i1 = np.searchsorted(distances[:-1], d_hi, side="right")
+                    j0 = np.searchsorted(durations[1:], t_lo, side="right")
+                    j1 = np.searchsorted(durations[:-1], t_hi, side="right")
+                    if i0 < i1 and j0 < j1:
+                        value = tree.value[node, 0, 0]
+                        block = (slice(i0, i1), slice(j0, j1))
+                        np.minimum(tree_min[block], value, out=tree_min[block])
+                        np.maximum(tree_max[block], value, out=tree_max[block])
+                    continue
+
+                threshold = tree.threshold[node]
+                left, right = tree.children_left[node], tree.children_right[node]
+                if feature == dist_feature:
+                    if d_lo < threshold:
+                        stack.append((left, d_lo, min(d_hi, threshold), t_lo, t_hi))
+                    if d_hi > threshold:
+                        stack.append((right, max(d_lo, threshold), d_hi, t_lo, t_hi))
+                elif feature == dur_feature:
+                    if t_lo < threshold:
+                        stack.append((left, d_lo, d_hi, t_lo, min(t_hi, threshold)))
+                    if t_hi > threshold:
+                        stack.append((right, d_lo, d_hi, max(t_lo, threshold), t_hi))
+                else:
+                    child = left if point[feature] <= threshold else right
+                    stack.append((child, d_lo, d_hi, t_lo, t_hi))
+
+            lower[k] += tree_min
+            upper[k] += tree_max
+
+    shape = tuple(len(names) for names in CATEGORIES.values())
+    n_trees = len(forest.estimators_)
+    return (
+        (lower / n_trees).reshape(*shape, *n_cells),
+        (upper / n_trees).reshape(*shape, *n_cells),
+    )
+
+
+def _locate(axis: list[float], x: float) -> tuple[int, float]:
+    """Return the lower cell index for x on axis and its fractional offset."""
+    i = min(max(bisect_right(axis, x) - 1, 0), len(axis) - 2)
+    return i, (x - axis[i]) / (axis[i + 1] - axis[i])
+
+
+def main() -> None:
+    from taxipred.backend.dependencies import (
+        compute_dataset_defaults,
+        load_model,
+        load_training_data,
+    )
+
+    parser = argparse.ArgumentParser(description="Precompute the price surface.")
+    parser.add_argument("--distance-points", type=int, default=len(DEFAULT_DISTANCES_KM))
+    parser.add_argument("--duration-points", type=int, default=len(DEFAULT_DURATIONS_MIN))
+    args = parser.parse_args()
+
+    model = load_model()
+    defaults = compute_dataset_defaults(load_training_data())
+    surface = PriceSurface.build(
+        model,
+        defaults,
+        np.linspace(DEFAULT_DISTANCES_KM[0], DEFAULT_DISTANCES_KM[-1], args.distance_points),
+        np.linspace(DEFAULT_DURATIONS_MIN[0], DEFAULT_DURATIONS_MIN[-1], args.duration_points),
+    )
+    surface.save()
+    print(f"Saved {PRICE_SURFACE} (max cell error bound {surface.max_error:.3f})")
+
+
+if __name__ == "__main__":
+    main()
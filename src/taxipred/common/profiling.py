@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import importlib
+import logging
+import sys
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """Collects wall-clock timings for the phases of app startup."""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.imports: dict[str, float] = {}
+        self.phases: dict[str, float] = {}
+        self.total: float | None = None
+        self.error: str | None = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block and record it under `name` (seconds)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    def profile_imports(self, modules: tuple[str, ...]) -> None:
+        """
+        Import each module in order and record how long it took.
+
+        Modules already present in `sys.modules` are recorded as 0.0, so the
+        breakdown attributes shared dependencies to the first module pulling them in.
+        """
+        for name in modules:
+            if name in sys.modules:
+                self.imports[name] = 0.0
+                continue
+            start = time.perf_counter()
+            importlib.import_module(name)
+            self.imports[name] = time.perf_counter() - start
+
+    def finish(self) -> None:
+        """Freeze the total startup time."""
+        self.total = time.perf_counter() - self._started
+
+    def fail(self, exc: BaseException) -> None:
+        """Record a startup failure and freeze the total startup time."""
+        self.error = f"{type(exc).__name__}: {exc}"
+        self.finish()
+
+    def as_dict(self) -> dict:
+        """Return the report as a JSON-serializable dict with millisecond values."""
+        return {
+            "imports_ms": {k: round(v * 1000, 2) for k, v in self.imports.items()},
+            "phases_ms": {k: round(v * 1000, 2) for k, v in self.phases.items()},
+            "total_ms": None if self.total is None else round(self.total * 1000, 2),
+            "error": self.error,
+        }
+
+    def log(self) -> None:
+        """Write the report to the module logger."""
+        report = self.as_dict()
+        for name, ms in report["imports_ms"].items():
+            logger.info("startup import %-20s %8.2f ms", name, ms)
+        for name, ms in report["phases_ms"].items():
+            logger.info("startup phase  %-20s %8.2f ms", name, ms)
+        if report["total_ms"] is not None:
+            logger.info("startup total  %-20s %8.2f ms", "", report["total_ms"])
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import logging
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.impute import SimpleImputer
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from taxipred.common.constants import MODEL, PRICE_SURFACE, TAXI_CSV_CLEANED
+
+logger = logging.getLogger(__name__)
+
+TARGET = "trip_price"
+
+
+def split_features_target(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+    """Split a cleaned dataset into features and the price target."""
+    return df.drop(columns=TARGET), df[TARGET]
+
+
+def build_pipeline(X: pd.DataFrame, n_estimators: int = 100) -> Pipeline:
+    """Build the unfitted preprocessing + Random Forest pipeline (see notebook 04)."""
+    num_features = X.select_dtypes(include="number").columns
+    cat_features = X.select_dtypes(include="object").columns
+
+    num_transformer = Pipeline(steps=[("imputer", SimpleImputer(strategy="median"))])
+    cat_transformer = Pipeline(
+        steps=[
+            ("imputer", SimpleImputer(strategy="most_frequent")),
+            ("onehot", OneHotEncoder(handle_unknown="ignore", drop="first")),
+        ]
+    )
+    preprocess = ColumnTransformer(
+        transformers=[
+            ("num", num_transformer, num_features),
+            ("cat", cat_transformer, cat_features),
+        ]
+    )
+    model = RandomForestRegressor(n_estimators=n_estimators, random_state=42)
+    return Pipeline(steps=[("preprocess", preprocess), ("model", model)])
+
+
+def full_retrain(df: pd.DataFrame) -> Pipeline:
+    """Fit a fresh pipeline on the full dataset."""
+    X, y = split_features_target(df)
+    return build_pipeline(X).fit(X, y)
+
+
+def categories_unchanged(pipeline: Pipeline, X_new: pd.DataFrame) -> bool:
+    """Return True if X_new has no categorical values unseen by the fitted encoder."""
+    preprocess = pipeline.named_steps["preprocess"]
+    cat_features = next(cols for name, _, cols in preprocess.transformers_ if name == "cat")
+    encoder = preprocess.named_transformers_["cat"].named_steps["onehot"]
+
+    for feature, known in zip(cat_features, encoder.categories_):
+        seen = set(X_new[feature].dropna().unique())
+        if not seen <= set(known):
+            return False
+    return True
+
+
+def incremental_retrain(
+    pipeline: Pipeline,
+    df_new: pd.DataFrame,
+    n_new_trees: int = 25,
+    max_trees: int = 100,
+    random_state: int | None = None,
+) -> Pipeline:
+    """
+    Return a copy of a fitted pipeline with its forest grown on new data only.
+
+    The input pipeline is left untouched. The fitted preprocessing is reused
+    as-is. New trees are added with `warm_start`, then the oldest trees are
+    retired so the forest never holds more than `max_trees` estimators. The
+    forest is reseeded before fitting (from `random_state`, or fresh entropy
+    when None) so repeated runs do not redraw the same tree seeds and
+    bootstrap samples.
+
+    Raises:
+        ValueError: If n_new_trees or max_trees is below 1, or if df_new contains
+            categories the fitted encoder has not seen; a full retrain is
+            required in that case.
+    """
+    if n_new_trees < 1 or max_trees < 1:
+        raise ValueError("n_new_trees and max_trees must both be at least 1.")
+
+    X_new, y_new = split_features_target(df_new)
+    if not categories_unchanged(pipeline, X_new):
+        raise ValueError("New data contains unseen categories; run a full retrain.")
+
+    if random_state is None:
+        random_state = int(np.random.SeedSequence().generate_state(1)[0])
+
+    pipeline = copy.deepcopy(pipeline)
+    forest = pipeline.named_steps["model"]
+    X_new_t = pipeline.named_steps["preprocess"].transform(X_new)
+
+    forest.set_params(
+        warm_start=True,
+        n_estimators=len(forest.estimators_) + n_new_trees,
+        random_state=random_state,
+    )
+    forest.fit(X_new_t, y_new)
+
+    forest.estimators_ = forest.estimators_[max(len(forest.estimators_) - max_trees, 0) :]
+    forest.set_params(warm_start=False, n_estimators=len(forest.estimators_))
+    return pipeline
+
+
+def compare_retraining(
+    df_history: pd.DataFrame,
+    df_new: pd.DataFrame,
+    holdout_size: float = 0.33,
+    n_new_trees: int = 25,
+    max_trees: int = 100,
+    random_state: int | None = None,
+) -> dict:
+    """
+    Compare incremental and full retraining on refit time and holdout MAE.
+
+    The base model for the incremental path is fitted on df_history only and
+    the holdout is drawn from df_new, so neither path has seen the holdout.
+    """
+    df_fit, df_holdout = train_test_split(df_new, test_size=holdout_size, random_state=42)
+    X_holdout, y_holdout = split_features_target(df_holdout)
+    base = full_retrain(df_history)
+
+    start = time.perf_counter()
+    incremental = incremental_retrain(base, df_fit, n_new_trees, max_trees, random_state)
+    incremental_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    full = full_retrain(pd.concat([df_history, df_fit], ignore_index=True))
+    full_s = time.perf_counter() - start
+
+    return {
+        "incremental": {
+            "refit_s": incremental_s,
+            "mae": mean_absolute_error(y_holdout, incremental.predict(X_holdout)),
+        },
+        "full": {
+            "refit_s": full_s,
+            "mae": mean_absolute_error(y_holdout, full.predict(X_holdout)),
+        },
+    }
+
+
+def save_model(pipeline: Pipeline) -> None:
+    """Write the model artifact and warn if the price surface is now stale."""
+    joblib.dump(pipeline, MODEL)
+    if PRICE_SURFACE.exists():
+        logger.warning(
+            "%s was built from the previous model and will be ignored by the API; "
+            "rebuild it with `python -m taxipred.backend.surface`",
+            PRICE_SURFACE,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Retrain the taxi price model.")
+    parser.add_argument("mode", choices=["full", "incremental", "compare"])
+    parser.add_argument(
+        "--new-data",
+        type=Path,
+        help="CSV of newly arrived trips (same columns as the cleaned dataset). "
+        "Required for incremental and compare; appended to the history for full.",
+    )
+    parser.add_argument("--new-trees", type=int, default=25)
+    parser.add_argument("--max-trees", type=int, default=100)
+    parser.add_argument(
+        "--seed", type=int, help="Seed for the new trees (default: fresh entropy)."
+    )
+    args = parser.parse_args()
+
+    if args.mode != "full" and args.new_data is None:
+        parser.error(f"--new-data is required for {args.mode}")
+    if args.new_trees < 1 or args.max_trees < 1:
+        parser.error("--new-trees and --max-trees must both be at least 1")
+
+    df_history = pd.read_csv(TAXI_CSV_CLEANED)
+    df_new = pd.read_csv(args.new_data) if args.new_data is not None else None
+
+    if args.mode == "full":
+        df = df_history if df_new is None else pd.concat([df_history, df_new], ignore_index=True)
+        save_model(full_retrain(df))
+        return
+
+    if args.mode == "incremental":
+        pipeline = incremental_retrain(
+            joblib.load(MODEL), df_new, args.new_trees, args.max_trees, args.seed
+        )
+        save_model(pipeline)
+        return
+
+    report = compare_retraining(
+        df_history,
+        df_new,
+        n_new_trees=args.new_trees,
+        max_trees=args.max_trees,
+        random_state=args.seed,
+    )
+    for path, result in report.items():
+        print(f"{path:<12} refit {result['refit_s']:.3f}s  MAE {result['mae']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,35 @@
 from __future__ import annotations
 
-from taxipred.frontend import ui
+import streamlit as st
+
+from taxipred.common.profiling import StartupReport
 
 MAX_DISTANCE_KM = 50.0
 
+FRONTEND_MODULES = (
+    "requests",
+    "taxipred.frontend.api_client",
+    "taxipred.frontend.data",
+    "taxipred.frontend.map",
+    "taxipred.frontend.ui",
+)
+
+
+@st.cache_resource
+def profile_startup() -> dict:
+    """Import the frontend modules once per process and log how long each took."""
+    report = StartupReport()
+    report.profile_imports(FRONTEND_MODULES)
+    report.finish()
+    report.log()
+    return report.as_dict()
+
 
 def main() -> None:
+    profile_startup()
+    # Imported after profiling so the report measures the first, uncached import.
+    from taxipred.frontend import ui
+
     ui.configure_page()
     ui.render_header()
     ui.render_app(MAX_DISTANCE_KM)
@@ -1,8 +1,16 @@
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import streamlit as st
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 @st.cache_data
 def load_training_data(path: str) -> pd.DataFrame:
     """Load a CSV dataset from disk (cached across Streamlit reruns)."""
+    import pandas as pd
+
     return pd.read_csv(path)
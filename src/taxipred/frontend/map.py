@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import pandas as pd
-import pydeck as pdk
 import requests
 import streamlit as st
 
@@ -65,6 +63,10 @@ def render_map(
     point_a: dict, point_b: dict, geometry: list, distance_km: float
 ) -> None:
     """Render route + start/end markers as a PyDeck map inside Streamlit."""
+    # Imported lazily: only the Point A + Point B flow draws a map.
+    import pandas as pd
+    import pydeck as pdk
+
     points = pd.DataFrame(
         [
             {